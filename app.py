@@ -1,8 +1,40 @@
 
+import csv
+import io
+import re
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import altair as alt
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+try:
+    import polars as pl
+except ImportError:
+    # Polars é opcional: sem ele o ETL usa o caminho PyArrow + pandas.
+    pl = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba também é opcional; sem ele o cálculo de retorno usa NumPy puro.
+    njit = None
+
+try:
+    import xxhash
+except ImportError:
+    # Sem xxhash o Streamlit usa o hasher padrão dele para os bytes.
+    xxhash = None
+
+# Chave de cache para os bytes dos uploads: o xxh3 processa gigabytes por
+# segundo, enquanto o hasher padrão do Streamlit percorre os bytes em
+# Python — diferença perceptível em CSVs de vários MB a cada rerun.
+if xxhash is not None:
+    _UPLOAD_HASH_FUNCS = {bytes: lambda raw: xxhash.xxh3_64(raw).intdigest()}
+else:
+    _UPLOAD_HASH_FUNCS = {}
 
 # ------------------------------------------------------------------
 # Configuração geral da página
@@ -63,58 +95,223 @@ def infer_company_name(filename: str) -> str:
     return filename.rsplit(".", 1)[0]
 
 
+# Remove em uma única passada: o espaço estranho comum em dados da web
+# (\u00a0), espaços normais, separadores de milhar e símbolo de moeda.
+_CLEAN_RE = re.compile("[\u00a0 ,$]")
+
+
 def clean_numeric_column(series: pd.Series) -> pd.Series:
     """Limpa colunas numéricas que vêm como texto com vírgulas, pontos e símbolos."""
-    s = (
-        series.astype(str)
-        .str.replace("\u00a0", "", regex=True)  # espaço estranho comum em dados da web
-        .str.replace(" ", "", regex=False)
-        .str.replace(",", "", regex=False)
-        .str.replace("$", "", regex=False)
-    )
+    s = series.astype(str).str.replace(_CLEAN_RE, "", regex=True)
     return pd.to_numeric(s, errors="coerce")
 
 
-def load_and_transform(files) -> pd.DataFrame:
-    """Lê todos os arquivos CSV enviados e devolve um único DataFrame consolidado.
+def parse_dates(series: pd.Series) -> pd.Series:
+    """Converte a coluna de datas usando formatos explícitos.
 
-    Saída com colunas padronizadas:
-    - company: nome da empresa
-    - date: data (datetime)
-    - price: preço de fechamento
-    - return_pct: retorno percentual em relação ao período anterior
+    Com `format=` o pandas usa o strptime em C (em vez do fallback
+    linha a linha do dateutil) e `cache=True` faz cada data única ser
+    interpretada uma vez só. Tenta o formato do investing.com em inglês
+    e, para as linhas que falharem, o formato com pontos usado nos
+    exports em português; o que ainda sobrar cai na inferência de
+    formato do pandas, como antes.
+    """
+    date = pd.to_datetime(series, format="%m/%d/%Y", errors="coerce", cache=True)
+    if date.isna().any():
+        fallback = pd.to_datetime(series, format="%d.%m.%Y", errors="coerce", cache=True)
+        date = date.combine_first(fallback)
+    if date.isna().any():
+        # Último recurso, só para as linhas que os formatos explícitos
+        # não cobriram (por exemplo datas ISO como 2020-01-03).
+        date = date.combine_first(pd.to_datetime(series, errors="coerce", cache=True))
+    return date
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _pct_change_by_group(codes, price):
+        """Retorno percentual por empresa, compilado pelo Numba.
+
+        Um único loop C sobre os códigos da categórica company e os
+        preços (já ordenados por company + date), escrevendo NaN na
+        fronteira entre empresas. cache=True evita recompilar a cada
+        inicialização do app.
+        """
+        out = np.empty(price.shape[0])
+        if price.shape[0] == 0:
+            return out
+        out[0] = np.nan
+        for i in range(1, price.shape[0]):
+            if codes[i] == codes[i - 1]:
+                out[i] = (price[i] / price[i - 1] - 1.0) * 100.0
+            else:
+                out[i] = np.nan
+        return out
+
+else:
+
+    def _pct_change_by_group(codes, price):
+        """Retorno percentual por empresa, vetorizado em NumPy puro."""
+        out = np.empty(price.shape[0])
+        if price.shape[0] == 0:
+            return out
+        out[0] = np.nan
+        out[1:] = np.where(
+            codes[1:] == codes[:-1],
+            (price[1:] / price[:-1] - 1.0) * 100.0,
+            np.nan,
+        )
+        return out
+
+
+def _find_required_columns(raw: bytes):
+    """Localiza as colunas Date e Price na linha de cabeçalho do CSV.
+
+    Lê apenas a primeira linha e devolve os nomes reais das duas colunas
+    (tolerando espaços extras), ou None se alguma estiver faltando. Com
+    isso os leitores projetam só as colunas usadas, sem gastar parsing
+    com Open/High/Low/Vol. etc., e arquivos inválidos são pulados antes
+    de qualquer leitura completa.
+    """
+    head = raw.split(b"\n", 1)[0]
+    try:
+        # utf-8-sig descarta o BOM que exports do Excel/web costumam ter
+        # (os leitores de CSV também o ignoram, então os nomes batem)
+        line = head.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        line = head.decode("latin-1")
+    names = next(csv.reader([line.strip()]), [])
+    by_stripped = {name.strip(): name for name in names}
+    if not {"Date", "Price"}.issubset(by_stripped):
+        return None
+    return [by_stripped["Date"], by_stripped["Price"]]
+
+
+def _read_csv_arrow(raw: bytes, columns) -> pd.DataFrame:
+    """Lê um CSV com o leitor C++ do PyArrow (bem mais rápido que o do pandas).
+
+    Só as colunas pedidas são materializadas, e como texto, para que a
+    limpeza/conversão continue sendo feita do mesmo jeito no restante do
+    ETL.
+    """
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types={c: pa.string() for c in columns},
+    )
+    try:
+        table = pa_csv.read_csv(pa.BufferReader(raw), convert_options=convert_options)
+    except pa.ArrowInvalid:
+        # tenta com outro encoding
+        table = pa_csv.read_csv(
+            pa.BufferReader(raw),
+            read_options=pa_csv.ReadOptions(encoding="latin-1"),
+            convert_options=convert_options,
+        )
+    return table.to_pandas()
+
+
+def _polars_clean(df, company: str, date_col: str, price_col: str, infer_dates: bool):
+    """Seleciona e limpa as colunas de um arquivo já lido pelo Polars.
+
+    Com `infer_dates=True` entra um terceiro braço de parse sem format=,
+    em que o Polars infere o formato (cobre datas ISO etc.) para as
+    linhas que os formatos explícitos não pegaram.
+    """
+    date_arms = [
+        pl.col(date_col).str.strptime(pl.Date, "%m/%d/%Y", strict=False),
+        pl.col(date_col).str.strptime(pl.Date, "%d.%m.%Y", strict=False),
+    ]
+    if infer_dates:
+        date_arms.append(pl.col(date_col).str.strptime(pl.Date, strict=False))
+
+    return df.select(
+        pl.lit(company).alias("company"),
+        pl.coalesce(date_arms).cast(pl.Datetime("ns")).alias("date"),
+        pl.col(price_col)
+        .str.replace_all("[\u00a0 ,$]", "")
+        .cast(pl.Float64, strict=False)
+        .alias("price"),
+    ).drop_nulls(["date", "price"])
+
+
+def _etl_polars(payloads):
+    """ETL completo em Polars: parse, limpeza, concat, sort e retorno.
+
+    Todo o estágio de ingestão roda no leitor de CSV multithread do
+    Polars e em expressões vetorizadas em Rust; o pandas só entra na
+    fronteira, com um único `.to_pandas()` no fim.
     """
     frames = []
+    skipped = []
+
+    for filename, raw in payloads:
+        columns = _find_required_columns(raw)
+        if columns is None:
+            skipped.append(filename)
+            continue
+        date_col, price_col = columns
+
+        # columns= projeta só Date/Price já no parser;
+        # infer_schema_length=0 lê tudo como texto (a limpeza decide os
+        # tipos); utf8-lossy cobre arquivos que não são UTF-8 válidos.
+        df = pl.read_csv(
+            io.BytesIO(raw),
+            columns=columns,
+            infer_schema_length=0,
+            encoding="utf8-lossy",
+        )
+
+        company = infer_company_name(filename)
 
-    for uploaded in files:
         try:
-            df = pd.read_csv(uploaded)
-        except Exception:
-            # tenta com outro encoding
-            uploaded.seek(0)
-            df = pd.read_csv(uploaded, encoding="latin-1")
-
-        # Normaliza nomes de colunas para evitar problemas de espaços
-        df.columns = [c.strip() for c in df.columns]
-
-        required_cols = {"Date", "Price"}
-        if not required_cols.issubset(df.columns):
-            st.warning(
-                f"O arquivo **{uploaded.name}** não possui as colunas mínimas exigidas "
-                f"({', '.join(required_cols)}). Ele será ignorado."
-            )
+            df = _polars_clean(df, company, date_col, price_col, infer_dates=True)
+        except pl.exceptions.ComputeError:
+            # A inferência de formato levanta ComputeError quando nenhuma
+            # linha tem formato reconhecível; refaz só com os formatos
+            # explícitos, equivalente ao errors="coerce" + dropna do
+            # caminho pandas (o arquivo contribui com zero linhas).
+            df = _polars_clean(df, company, date_col, price_col, infer_dates=False)
+
+        frames.append(df)
+
+    if not frames:
+        return _empty_data(), skipped
+
+    data = (
+        pl.concat(frames)
+        .sort(["company", "date"])
+        .with_columns(
+            ((pl.col("price") / pl.col("price").shift(1).over("company") - 1) * 100.0)
+            .alias("return_pct")
+        )
+        .to_pandas(use_pyarrow_extension_array=True)
+    )
+    data["company"] = data["company"].astype("category")
+    return data, skipped
+
+
+def _etl_pandas(payloads):
+    """ETL em PyArrow + pandas, usado quando o Polars não está instalado."""
+    frames = []
+    skipped = []
+
+    for filename, raw in payloads:
+        columns = _find_required_columns(raw)
+        if columns is None:
+            skipped.append(filename)
             continue
+        date_col, price_col = columns
+
+        df = _read_csv_arrow(raw, columns)
 
-        company = infer_company_name(uploaded.name)
+        company = infer_company_name(filename)
 
         # Conversão de datas
-        date = pd.to_datetime(
-            df["Date"],
-            errors="coerce",
-        )
+        date = parse_dates(df[date_col])
 
         # Limpeza do preço
-        price = clean_numeric_column(df["Price"])
+        price = clean_numeric_column(df[price_col])
 
         temp = pd.DataFrame(
             {
@@ -130,56 +327,162 @@ def load_and_transform(files) -> pd.DataFrame:
         frames.append(temp)
 
     if not frames:
-        return pd.DataFrame(columns=["company", "date", "price", "return_pct"])
+        return _empty_data(), skipped
 
     data = pd.concat(frames, ignore_index=True)
 
-    # Garante ordenação por empresa + data
-    data = data.sort_values(["company", "date"])
+    # company vira categórica: poucos rótulos repetidos em milhares de
+    # linhas ficam como códigos inteiros, o que barateia groupby, isin,
+    # unique e a ordenação (sem hashing de strings Python).
+    data["company"] = data["company"].astype("category")
 
-    # Calcula retorno percentual por empresa
-    data["return_pct"] = (
-        data.groupby("company")["price"].pct_change() * 100.0
+    # Garante ordenação por empresa + data. O lexsort roda sobre os
+    # códigos inteiros da categórica e os timestamps como int64 —
+    # comparações em C, sem hashear/comparar strings Python.
+    order = np.lexsort(
+        (data["date"].to_numpy().view("i8"), data["company"].cat.codes.to_numpy())
     )
+    data = data.iloc[order]
+
+    # Calcula retorno percentual por empresa em uma única passada sobre
+    # os arrays de códigos/preços (kernel Numba quando disponível).
+    codes = data["company"].cat.codes.to_numpy()
+    price = data["price"].to_numpy()
+    data["return_pct"] = _pct_change_by_group(codes, price)
+
+    return data, skipped
+
+
+def _empty_data() -> pd.DataFrame:
+    return pd.DataFrame(columns=["company", "date", "price", "return_pct"])
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_UPLOAD_HASH_FUNCS)
+def _load_and_transform_cached(payloads):
+    """Versão cacheada do ETL, recebendo tuplas `(nome_do_arquivo, bytes)`.
+
+    Como a chave do cache são os bytes dos arquivos, reexecuções do app
+    (mover slider, trocar filtros) reaproveitam o resultado sem reparsear
+    os CSVs. Usa o Polars quando disponível; caso contrário cai no
+    caminho PyArrow + pandas.
+    """
+    if pl is not None:
+        data, skipped = _etl_polars(payloads)
+    else:
+        data, skipped = _etl_pandas(payloads)
+
+    # Mantém os buffers com backing Arrow de ponta a ponta: as fronteiras
+    # pandas→Arrow (st.dataframe, Altair, hashing do cache) viram
+    # zero-cópia. company continua categórica porque o groupby e a
+    # ordenação usam os códigos inteiros — e o Arrow a serializa
+    # dict-encoded do mesmo jeito.
+    if not data.empty:
+        data = data.astype(
+            {
+                "date": "timestamp[ns][pyarrow]",
+                "price": "double[pyarrow]",
+                "return_pct": "double[pyarrow]",
+            }
+        )
+
+    for filename in skipped:
+        st.warning(
+            f"O arquivo **{filename}** não possui as colunas mínimas exigidas "
+            f"(Date, Price). Ele será ignorado."
+        )
 
-    return data
+    # Metadados dos filtros calculados uma vez aqui dentro: nos reruns os
+    # widgets da barra lateral não precisam re-escanear as colunas.
+    if data.empty:
+        meta = {"companies": [], "min_date": None, "max_date": None}
+    else:
+        meta = {
+            "companies": sorted(data["company"].cat.categories.tolist()),
+            "min_date": data["date"].min().date(),
+            "max_date": data["date"].max().date(),
+        }
 
+    return data, meta
 
+
+def load_and_transform(files):
+    """Lê todos os arquivos CSV enviados e devolve `(data, meta)`.
+
+    `data` é um único DataFrame consolidado com colunas padronizadas:
+    - company: nome da empresa
+    - date: data (datetime)
+    - price: preço de fechamento
+    - return_pct: retorno percentual em relação ao período anterior
+
+    `meta` traz a lista de empresas e o intervalo de datas, já prontos
+    para os widgets de filtro.
+    """
+    payloads = tuple((uploaded.name, uploaded.getvalue()) for uploaded in files)
+    return _load_and_transform_cached(payloads)
+
+
+@st.cache_data(show_spinner=False)
 def compute_summary_stats(data: pd.DataFrame) -> pd.DataFrame:
     """Calcula estatísticas descritivas por empresa."""
     if data.empty:
         return pd.DataFrame()
 
-    stats = []
-
-    for company, df_c in data.groupby("company"):
-        df_c = df_c.sort_values("date")
-        first_price = df_c["price"].iloc[0]
-        last_price = df_c["price"].iloc[-1]
-        total_return = (last_price / first_price - 1) * 100 if first_price > 0 else np.nan
-
+    # O DataFrame já vem ordenado por (company, date), então "first"/"last"
+    # correspondem ao primeiro e ao último preço do período. Uma única
+    # agregação substitui o loop Python por empresa.
+    agg = data.groupby("company", sort=False, observed=True).agg(
+        first_price=("price", "first"),
+        last_price=("price", "last"),
         # Volatilidade: desvio padrão do retorno semanal
-        vol = df_c["return_pct"].std()
-
+        vol=("return_pct", "std"),
         # Máxima alta e máxima queda semanais
-        max_up = df_c["return_pct"].max()
-        max_down = df_c["return_pct"].min()
+        max_up=("return_pct", "max"),
+        max_down=("return_pct", "min"),
+    )
 
-        stats.append(
-            {
-                "Empresa": company,
-                "Preço inicial": round(first_price, 2),
-                "Preço final": round(last_price, 2),
-                "Retorno total (%)": round(total_return, 2),
-                "Volatilidade média (%)": round(vol, 2),
-                "Maior alta semanal (%)": round(max_up, 2),
-                "Maior queda semanal (%)": round(max_down, 2),
-            }
-        )
+    agg["total_return"] = np.where(
+        agg["first_price"] > 0,
+        (agg["last_price"] / agg["first_price"] - 1) * 100,
+        np.nan,
+    )
 
-    return pd.DataFrame(stats)
+    stats = agg.round(2).reset_index()
+    stats = stats[
+        ["company", "first_price", "last_price", "total_return", "vol", "max_up", "max_down"]
+    ]
+    stats.columns = [
+        "Empresa",
+        "Preço inicial",
+        "Preço final",
+        "Retorno total (%)",
+        "Volatilidade média (%)",
+        "Maior alta semanal (%)",
+        "Maior queda semanal (%)",
+    ]
+    return stats.sort_values("Empresa", ignore_index=True)
+
+
+@st.cache_data(show_spinner=False)
+def resample_weekly(data: pd.DataFrame) -> pd.DataFrame:
+    """Agrega a série para um ponto por semana (fechamento de sexta-feira).
+
+    Os gráficos não precisam de mais resolução que isso, e mandar menos
+    pontos para o Altair reduz bastante o JSON enviado ao navegador e o
+    tempo de renderização.
+    """
+    # Com date com backing Arrow o Grouper perde o nome do nível e o
+    # reset_index devolveria a coluna como "level_1" — o rename_axis
+    # garante que os gráficos continuem encontrando o campo "date".
+    weekly = (
+        data.groupby(["company", pd.Grouper(key="date", freq="W-FRI")], observed=True)
+        .last()
+        .rename_axis(["company", "date"])
+        .reset_index()
+    )
+    return weekly.dropna(subset=["price"])
 
 
+@st.cache_data(show_spinner=False)
 def get_dips_and_momentum(data: pd.DataFrame, threshold: float = 10.0):
     """Identifica DIPs (quedas fortes) e Momentum (altas fortes)."""
     if data.empty:
@@ -188,15 +491,80 @@ def get_dips_and_momentum(data: pd.DataFrame, threshold: float = 10.0):
             pd.DataFrame(columns=["date", "company", "price", "return_pct"]),
         )
 
-    dips = data[data["return_pct"] <= -abs(threshold)].copy()
-    momentum = data[data["return_pct"] >= abs(threshold)].copy()
+    # Uma única varredura do retorno: marca |retorno| >= limite e separa
+    # quedas de altas pelo sinal, em vez de filtrar a coluna duas vezes.
+    vals = data["return_pct"].to_numpy()
+    hit = np.abs(vals) >= abs(threshold)
+    extremes = data.loc[hit]
+    hit_vals = vals[hit]
+
+    dips = extremes[hit_vals < 0]
+    momentum = extremes[hit_vals > 0]
 
+    # Só os resultados (bem menores que o DataFrame completo) são ordenados
     dips = dips.sort_values(["date", "company"], ascending=[False, True])
     momentum = momentum.sort_values(["date", "company"], ascending=[False, True])
 
     return dips, momentum
 
 
+@st.cache_resource
+def _price_spec() -> alt.Chart:
+    """Espec do gráfico de preços, montada uma única vez por processo.
+
+    Só a parte fixa (encodings, título, altura) é cacheada; os dados são
+    anexados na hora de exibir com `.properties(data=...)`, então o
+    objeto do gráfico não é reconstruído a cada rerun.
+    """
+    return (
+        alt.Chart()
+        .mark_line()
+        .encode(
+            x=alt.X("date:T", title="Data"),
+            y=alt.Y("price:Q", title="Preço de fechamento"),
+            color=alt.Color("company:N", title="Empresa"),
+            tooltip=["date:T", "company:N", "price:Q", "return_pct:Q"],
+        )
+        .properties(height=400)
+        .interactive()
+    )
+
+
+@st.cache_resource
+def _return_spec() -> alt.Chart:
+    """Espec do gráfico de retornos, montada uma única vez por processo."""
+    return (
+        alt.Chart()
+        .mark_line()
+        .encode(
+            x=alt.X("date:T", title="Data"),
+            y=alt.Y("return_pct:Q", title="Retorno (%)"),
+            color=alt.Color("company:N", title="Empresa"),
+            tooltip=["date:T", "company:N", "price:Q", "return_pct:Q"],
+        )
+        .properties(height=400)
+        .interactive()
+    )
+
+
+def _display_table(frame: pd.DataFrame) -> pa.Table:
+    """Monta a tabela de DIPs/Momentum como `pyarrow.Table` para exibição.
+
+    O st.dataframe transporta os dados em Arrow de qualquer forma;
+    entregar o Table pronto (com a data já como date32 e a empresa
+    dict-encoded pela categórica) evita a conversão pandas→Arrow que o
+    Streamlit refaria a cada rerun.
+    """
+    return pa.Table.from_pydict(
+        {
+            "Data": pa.Array.from_pandas(frame["date"]).cast(pa.date32(), safe=False),
+            "Empresa": pa.Array.from_pandas(frame["company"]),
+            "Preço": pa.Array.from_pandas(frame["price"]),
+            "Retorno (%)": pa.Array.from_pandas(frame["return_pct"]),
+        }
+    )
+
+
 # ------------------------------------------------------------------
 # Upload de arquivos
 # ------------------------------------------------------------------
@@ -213,9 +581,9 @@ if not uploaded_files:
     st.warning("Envie ao menos um arquivo CSV para iniciar a análise.")
     st.stop()
 
-data = load_and_transform(uploaded_files)
+full_data, meta = load_and_transform(uploaded_files)
 
-if data.empty:
+if full_data.empty:
     st.error("Não foi possível carregar dados válidos dos arquivos enviados.")
     st.stop()
 
@@ -225,7 +593,7 @@ if data.empty:
 
 st.sidebar.title("⚙️ Filtros de análise")
 
-companies = sorted(data["company"].unique().tolist())
+companies = meta["companies"]
 selected_companies = st.sidebar.multiselect(
     "Selecione as empresas:",
     options=companies,
@@ -236,10 +604,8 @@ if not selected_companies:
     st.sidebar.error("Selecione ao menos uma empresa.")
     st.stop()
 
-data = data[data["company"].isin(selected_companies)]
-
-min_date = data["date"].min().date()
-max_date = data["date"].max().date()
+min_date = meta["min_date"]
+max_date = meta["max_date"]
 
 date_range = st.sidebar.date_input(
     "Período de análise:",
@@ -253,8 +619,18 @@ if isinstance(date_range, tuple):
 else:
     start_date, end_date = min_date, max_date
 
-mask = (data["date"].dt.date >= start_date) & (data["date"].dt.date <= end_date)
-data = data[mask]
+# Combina os filtros de empresa e de período em uma única máscara e
+# fatia o DataFrame completo uma vez só, em vez de reatribuir `data`
+# (e copiar tudo) a cada filtro. A comparação de datas é feita direto
+# no datetime64 (inteiros em C), sem materializar objetos datetime.date.
+lo = pd.Timestamp(start_date)
+hi = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+mask = (
+    full_data["company"].isin(selected_companies)
+    & (full_data["date"] >= lo)
+    & (full_data["date"] < hi)
+)
+data = full_data[mask]
 
 if data.empty:
     st.error("Nenhum dado no intervalo selecionado. Ajuste as datas ou as empresas.")
@@ -271,41 +647,23 @@ st.success(
 
 st.header("2️⃣ Gráficos de Preços e Retornos")
 
+# Os gráficos usam a versão semanal (bem menor); tabelas e estatísticas
+# continuam usando o DataFrame completo.
+data_plot = resample_weekly(data)
+
 col_price, col_return = st.columns(2)
 
 with col_price:
     st.subheader("Preço ao longo do tempo")
 
-    price_chart = (
-        alt.Chart(data)
-        .mark_line()
-        .encode(
-            x=alt.X("date:T", title="Data"),
-            y=alt.Y("price:Q", title="Preço de fechamento"),
-            color=alt.Color("company:N", title="Empresa"),
-            tooltip=["date:T", "company:N", "price:Q", "return_pct:Q"],
-        )
-        .properties(height=400)
-        .interactive()
-    )
+    price_chart = _price_spec().properties(data=data_plot)
 
     st.altair_chart(price_chart, use_container_width=True)
 
 with col_return:
     st.subheader("Retornos semanais (%)")
 
-    return_chart = (
-        alt.Chart(data.dropna(subset=["return_pct"]))
-        .mark_line()
-        .encode(
-            x=alt.X("date:T", title="Data"),
-            y=alt.Y("return_pct:Q", title="Retorno (%)"),
-            color=alt.Color("company:N", title="Empresa"),
-            tooltip=["date:T", "company:N", "price:Q", "return_pct:Q"],
-        )
-        .properties(height=400)
-        .interactive()
-    )
+    return_chart = _return_spec().properties(data=data_plot.dropna(subset=["return_pct"]))
 
     st.altair_chart(return_chart, use_container_width=True)
 
@@ -338,34 +696,14 @@ with col_dip:
     if dips.empty:
         st.info("Não foram encontradas quedas tão fortes no período/empresas selecionados.")
     else:
-        dips_view = dips[["date", "company", "price", "return_pct"]].copy()
-        dips_view["date"] = dips_view["date"].dt.date
-        dips_view = dips_view.rename(
-            columns={
-                "date": "Data",
-                "company": "Empresa",
-                "price": "Preço",
-                "return_pct": "Retorno (%)",
-            }
-        )
-        st.dataframe(dips_view, use_container_width=True)
+        st.dataframe(_display_table(dips), use_container_width=True)
 
 with col_mom:
     st.subheader(f"Momentum – Altas ≥ {threshold}%")
     if momentum.empty:
         st.info("Não foram encontradas altas tão fortes no período/empresas selecionados.")
     else:
-        mom_view = momentum[["date", "company", "price", "return_pct"]].copy()
-        mom_view["date"] = mom_view["date"].dt.date
-        mom_view = mom_view.rename(
-            columns={
-                "date": "Data",
-                "company": "Empresa",
-                "price": "Preço",
-                "return_pct": "Retorno (%)",
-            }
-        )
-        st.dataframe(mom_view, use_container_width=True)
+        st.dataframe(_display_table(momentum), use_container_width=True)
 
 # ------------------------------------------------------------------
 # Seção 4: Estatísticas Resumidas
@@ -378,7 +716,7 @@ stats_df = compute_summary_stats(data)
 if stats_df.empty:
     st.info("Sem dados suficientes para calcular estatísticas.")
 else:
-    st.dataframe(stats_df, use_container_width=True)
+    st.dataframe(pa.Table.from_pandas(stats_df, preserve_index=False), use_container_width=True)
 
     st.markdown(
         '''